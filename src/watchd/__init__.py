@@ -2,8 +2,21 @@
 
 __version__ = "0.1.0"
 
-from watchd.app import Watchd
+from typing import TYPE_CHECKING
+
 from watchd.registry import agent
 from watchd.schedule import every
 
+if TYPE_CHECKING:
+    from watchd.app import Watchd
+
 __all__ = ["Watchd", "agent", "every"]
+
+
+def __getattr__(name: str):
+    # Watchd pulls in the store and runner; only import it when asked for.
+    if name == "Watchd":
+        from watchd.app import Watchd
+
+        return Watchd
+    raise AttributeError(f"module 'watchd' has no attribute '{name}'")
@@ -10,8 +10,10 @@ if TYPE_CHECKING:
     from watchd.schedule import Schedule
     from watchd.store import Run, Store
 
+_MISSING = object()
 
-@dataclass
+
+@dataclass(slots=True)
 class Agent:
     name: str
     fn: Callable
@@ -22,58 +24,75 @@ class Agent:
 class StateProxy(MutableMapping):
     """Dict-like proxy that reads/writes agent state to SQLite.
 
-    Lazy-loads on first access. Writes through on __setitem__.
-    Tracks dirty keys for bulk flush.
+    Writes land in an overlay on top of the persisted state, which is
+    lazy-loaded on first read. flush() upserts the overlay and deletes
+    removed keys, then folds both into the loaded base.
     """
 
+    __slots__ = ("_store", "_agent", "_base", "_overlay", "_deleted_keys")
+
     def __init__(self, store: Store, agent_name: str):
         self._store = store
         self._agent = agent_name
-        self._data: dict | None = None
-        self._dirty: dict[str, object] = {}
+        self._base: dict | None = None
+        self._overlay: dict[str, object] = {}
         self._deleted_keys: set[str] = set()
 
-    def _load(self):
-        if self._data is None:
-            self._data = self._store.get_state(self._agent)
+    def _load(self) -> dict:
+        if self._base is None:
+            self._base = self._store.get_state(self._agent)
+        return self._base
 
     def __getitem__(self, key):
-        self._load()
-        return self._data[key]
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._deleted_keys:
+            raise KeyError(key)
+        return self._load()[key]
 
     def __setitem__(self, key, value):
-        self._load()
-        self._data[key] = value
-        self._dirty[key] = value
+        self._overlay[key] = value
+        self._deleted_keys.discard(key)
 
     def __delitem__(self, key):
-        self._load()
-        del self._data[key]
-        self._deleted_keys.add(key)
-        self._dirty.pop(key, None)
+        base = self._load()
+        in_base = key in base and key not in self._deleted_keys
+        if self._overlay.pop(key, _MISSING) is _MISSING and not in_base:
+            raise KeyError(key)
+        if key in base:
+            self._deleted_keys.add(key)
 
     def __iter__(self):
-        self._load()
-        return iter(self._data)
+        base = self._load()
+        for key in base:
+            if key not in self._deleted_keys:
+                yield key
+        for key in self._overlay:
+            if key not in base:
+                yield key
 
     def __len__(self):
-        self._load()
-        return len(self._data)
+        base = self._load()
+        added = sum(1 for key in self._overlay if key not in base)
+        return len(base) - len(self._deleted_keys) + added
 
     def flush(self):
-        if self._data is None:
+        if not (self._overlay or self._deleted_keys):
             return
-        if self._deleted_keys:
-            self._store.delete_state_keys(self._agent, self._deleted_keys)
-            self._deleted_keys.clear()
-        if self._dirty:
-            self._store.set_state_bulk(self._agent, self._dirty)
-            self._dirty.clear()
+        self._store.flush_state(self._agent, self._overlay, self._deleted_keys)
+        if self._base is not None:
+            for key in self._deleted_keys:
+                self._base.pop(key, None)
+            self._base.update(self._overlay)
+        self._overlay.clear()
+        self._deleted_keys.clear()
 
 
 class AgentContext:
     """Passed to the decorated function at runtime."""
 
+    __slots__ = ("agent_name", "run_id", "store", "log", "_state")
+
     def __init__(self, agent_name: str, run_id: str, store: Store, log):
         self.agent_name = agent_name
         self.run_id = run_id
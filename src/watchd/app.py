@@ -4,20 +4,19 @@ from __future__ import annotations
 
 import signal
 import sys
-
-import structlog
+from typing import TYPE_CHECKING
 
 from watchd.agent import Agent
-from watchd.runner import execute_agent, install_capture, uninstall_capture
-from watchd.schedule import Schedule
-from watchd.store import Store
 
-log = structlog.get_logger()
+if TYPE_CHECKING:
+    from watchd.schedule import Schedule
 
 
 class Watchd:
-    def __init__(self, db: str = "./watchd.db"):
-        self.store = Store(db)
+    def __init__(self, db: str = "./watchd.db", synchronous: str = "normal"):
+        from watchd.store import Store
+
+        self.store = Store(db, synchronous=synchronous)
         self.agents: dict[str, Agent] = {}
         self.scheduler = None
 
@@ -35,11 +34,13 @@ class Watchd:
 
     def start(self):
         """Start scheduler and block."""
+        import structlog
         from apscheduler.schedulers.blocking import BlockingScheduler
 
-        install_capture()
+        log = structlog.get_logger()
         self.store.init()
         self._sync_agents()
+        self.store.start_writer()
 
         self.scheduler = BlockingScheduler()
 
@@ -59,7 +60,6 @@ class Watchd:
             log.info("shutting_down")
             if self.scheduler:
                 self.scheduler.shutdown(wait=False)
-            uninstall_capture()
             self.store.close()
             sys.exit(0)
 
@@ -71,15 +71,13 @@ class Watchd:
 
     def run(self, agent_name: str):
         """Run one agent immediately."""
-        install_capture()
-        try:
-            self.store.init()
-            self._sync_agents()
-            return self._execute(agent_name)
-        finally:
-            uninstall_capture()
+        self.store.init()
+        self._sync_agents()
+        return self._execute(agent_name)
 
     def _execute(self, agent_name: str):
+        from watchd.runner import execute_agent
+
         agent = self.agents.get(agent_name)
         if agent is None:
             raise KeyError(f"Agent '{agent_name}' not found")
@@ -3,21 +3,29 @@
 from __future__ import annotations
 
 import importlib
-import importlib.metadata
-import json
+import importlib.util
 import sys
 from pathlib import Path
 from typing import Annotated
 
 import cyclopts
 
-from watchd.config import load_config
-from watchd.discovery import discover_agents
+
+def _get_version() -> str:
+    """Use watchd.__version__; only scan dist-info metadata if it's missing."""
+    try:
+        from watchd import __version__
+    except ImportError:
+        import importlib.metadata
+
+        return importlib.metadata.version("watchd")
+    return __version__
+
 
 app = cyclopts.App(
     name="watchd",
     help="Schedule, run, and track AI agents with zero infra.",
-    version=importlib.metadata.version("watchd"),
+    version=_get_version(),
 )
 
 _DEFAULT_APP_LOCATIONS = ["app:app", "main:app", "watchd_app:app"]
@@ -28,6 +36,7 @@ db = "./watchd.db"
 agents_dir = "watchd_agents"
 # log_level = "info"
 # timezone = "UTC"
+# synchronous = "normal"
 """
 
 _AGENT_TEMPLATE = """\
@@ -41,24 +50,39 @@ def {name}(ctx):
     return "ok"
 """
 
+# Agent names are validated identifiers, so rendering is plain byte concatenation.
+_AGENT_TEMPLATE_PREFIX, _AGENT_TEMPLATE_SUFFIX = (
+    part.encode() for part in _AGENT_TEMPLATE.split("{name}")
+)
+
+
+def _render_agent(name: str) -> bytes:
+    return _AGENT_TEMPLATE_PREFIX + name.encode() + _AGENT_TEMPLATE_SUFFIX
+
 
 def _resolve_from_config():
     """Load config, discover agents, build a Watchd instance."""
-    from watchd.app import Watchd
-
-    config = load_config()
-    toml_exists = (Path.cwd() / "watchd.toml").exists()
-    agents_dir = Path.cwd() / config.agents_dir
+    from watchd.config import Config, read_config
 
-    if toml_exists and not agents_dir.is_dir():
-        print(
-            f"Agents directory '{config.agents_dir}' not found. Run 'watchd init'.", file=sys.stderr
-        )
-        sys.exit(1)
+    cwd = Path.cwd()
+    config = read_config(cwd / "watchd.toml")
+    toml_exists = config is not None
+    if config is None:
+        config = Config()
+    agents_dir = cwd / config.agents_dir
 
     if not agents_dir.is_dir():
+        if toml_exists:
+            print(
+                f"Agents directory '{config.agents_dir}' not found. Run 'watchd init'.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
         return None
 
+    from watchd.app import Watchd
+    from watchd.discovery import discover_agents
+
     agents = discover_agents(agents_dir)
     if not agents:
         if toml_exists:
@@ -69,7 +93,7 @@ def _resolve_from_config():
             sys.exit(1)
         return None
 
-    w = Watchd(db=config.db)
+    w = Watchd(db=config.db, synchronous=config.synchronous)
     w.agents.update(agents)
     return w
 
@@ -88,6 +112,16 @@ def _resolve_legacy(app_path: str | None):
         if ":" not in candidate:
             raise cyclopts.ValidationError(f"Expected module:variable format, got: {candidate}")
         module_path, var_name = candidate.rsplit(":", 1)
+        # Check for default candidates before importing so missing ones cost
+        # a path lookup, not an import attempt. An explicit --app is imported
+        # directly so its real import error surfaces.
+        if not app_path:
+            try:
+                spec = importlib.util.find_spec(module_path)
+            except (ImportError, ValueError):
+                spec = None
+            if spec is None:
+                continue
         try:
             module = importlib.import_module(module_path)
         except ImportError:
@@ -130,8 +164,9 @@ def _resolve(app_path: str | None = None):
 @app.command
 def init():
     """Create watchd.toml and watchd_agents/ with an example agent."""
-    toml_path = Path.cwd() / "watchd.toml"
-    agents_dir = Path.cwd() / "watchd_agents"
+    cwd = Path.cwd()
+    toml_path = cwd / "watchd.toml"
+    agents_dir = cwd / "watchd_agents"
 
     if toml_path.exists():
         print(f"Already exists: {toml_path.name}")
@@ -142,10 +177,10 @@ def init():
     agents_dir.mkdir(exist_ok=True)
     example = agents_dir / "example.py"
     if example.exists():
-        print(f"Already exists: {example.relative_to(Path.cwd())}")
+        print(f"Already exists: {example.relative_to(cwd)}")
     else:
-        example.write_text(_AGENT_TEMPLATE.format(name="example"))
-        print(f"Created {example.relative_to(Path.cwd())}")
+        example.write_bytes(_render_agent("example"))
+        print(f"Created {example.relative_to(cwd)}")
 
     print("\nNext: watchd list, watchd run example, watchd up")
 
@@ -157,8 +192,11 @@ def new(name: str):
         print(f"Invalid agent name: '{name}'. Must be a valid Python identifier.", file=sys.stderr)
         sys.exit(1)
 
-    config = load_config()
-    agents_dir = Path.cwd() / config.agents_dir
+    from watchd.config import load_config
+
+    cwd = Path.cwd()
+    config = load_config(cwd / "watchd.toml")
+    agents_dir = cwd / config.agents_dir
     agents_dir.mkdir(exist_ok=True)
 
     filepath = (agents_dir / f"{name}.py").resolve()
@@ -167,10 +205,10 @@ def new(name: str):
         sys.exit(1)
 
     if filepath.exists():
-        print(f"Already exists: {filepath.relative_to(Path.cwd())}")
+        print(f"Already exists: {filepath.relative_to(cwd)}")
         return
-    filepath.write_text(_AGENT_TEMPLATE.format(name=name))
-    print(f"Created {filepath.relative_to(Path.cwd())}")
+    filepath.write_bytes(_render_agent(name))
+    print(f"Created {filepath.relative_to(cwd)}")
 
 
 @app.command
@@ -205,11 +243,11 @@ def list_agents(
     if not watchd.agents:
         print("No agents registered.")
         return
-    print(f"{'Agent':<25} {'Schedule':<30} {'Retries'}")
-    print("-" * 65)
+    lines = [f"{'Agent':<25} {'Schedule':<30} {'Retries'}", "-" * 65]
     for a in watchd.agents.values():
         schedule = str(a.schedule) if a.schedule else "manual"
-        print(f"{a.name:<25} {schedule:<30} {a.retries}")
+        lines.append(f"{a.name:<25} {schedule:<30} {a.retries}")
+    _write_lines(lines)
 
 
 @app.command
@@ -223,21 +261,15 @@ def history(
     watchd = _resolve(app_path)
     watchd.store.init()
 
-    if agent_name:
-        runs = watchd.store.get_runs(agent_name, limit=limit)
-    else:
-        runs = watchd.store.get_all_runs(limit=limit)
-
-    if not runs:
+    rows = watchd.store.get_runs_formatted(agent_name, limit=limit)
+    if not rows:
         print("No runs found.")
         return
 
-    print(f"{'ID':<14} {'Agent':<20} {'Status':<10} {'Duration':<12} {'Started'}")
-    print("-" * 80)
-    for r in runs:
-        duration = f"{r.duration_ms:.0f}ms" if r.duration_ms else "-"
-        started = r.started_at.strftime("%Y-%m-%d %H:%M:%S") if r.started_at else "-"
-        print(f"{r.id:<14} {r.agent:<20} {r.status:<10} {duration:<12} {started}")
+    lines = [f"{'ID':<14} {'Agent':<20} {'Status':<10} {'Duration':<12} {'Started'}", "-" * 80]
+    for run_id, agent, status, duration, started in rows:
+        lines.append(f"{run_id:<14} {agent:<20} {status:<10} {duration:<12} {started}")
+    _write_lines(lines)
 
 
 @app.command
@@ -257,15 +289,16 @@ def logs(
         if not r:
             print(f"Run '{run_id}' not found.")
             return
-        _print_run_detail(r)
+        _write_lines(_run_detail_lines(r))
     else:
-        runs = watchd.store.get_runs(agent_name, limit=limit)
-        if not runs:
+        lines = []
+        for r in watchd.store.iter_runs(agent_name, limit=limit):
+            lines += _run_detail_lines(r)
+            lines.append("")
+        if not lines:
             print(f"No runs found for '{agent_name}'.")
             return
-        for r in runs:
-            _print_run_detail(r)
-            print()
+        _write_lines(lines)
 
 
 @app.command
@@ -275,6 +308,8 @@ def state(
     app_path: Annotated[str | None, cyclopts.Parameter(name="--app")] = None,
 ):
     """Show persisted state for an agent."""
+    import json
+
     watchd = _resolve(app_path)
     watchd.store.init()
     data = watchd.store.get_state(agent_name)
@@ -287,6 +322,7 @@ def state(
 @app.command
 def deploy(*, check: bool = False):
     """Deploy agents to a remote server via SSH."""
+    from watchd.config import load_config
     from watchd.deploy import deploy as run_deploy, preflight
 
     config = load_config()
@@ -305,16 +341,23 @@ def _print_run(r):
         print(f"  error: {r.error}")
 
 
-def _print_run_detail(r):
+def _run_detail_lines(r) -> list[str]:
     duration = f"{r.duration_ms:.0f}ms" if r.duration_ms else "-"
     started = r.started_at.strftime("%Y-%m-%d %H:%M:%S") if r.started_at else "-"
-    print(f"--- {r.id} [{r.status}] {started} ({duration}) ---")
+    lines = [f"--- {r.id} [{r.status}] {started} ({duration}) ---"]
     if r.result:
-        print(f"result: {r.result}")
+        lines.append(f"result: {r.result}")
     if r.output:
-        print(r.output)
+        lines.append(r.output)
     if r.error:
-        print(f"error: {r.error}")
+        lines.append(f"error: {r.error}")
+    return lines
+
+
+def _write_lines(lines: list[str]):
+    """Write a block of output in one call instead of one print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def main():
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import functools
+import os
 import sys
 import tomllib
 from dataclasses import dataclass
 from pathlib import Path
 
 
-@dataclass
+# SQLite PRAGMA synchronous levels accepted in watchd.toml and by Store.
+SYNCHRONOUS_MODES = ("off", "normal", "full", "extra")
+
+
+@dataclass(frozen=True)
 class DeployConfig:
     host: str = ""
     path: str = ""
@@ -16,28 +22,58 @@ class DeployConfig:
     keep_releases: int = 5
 
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
     db: str = "./watchd.db"
     agents_dir: str = "watchd_agents"
     log_level: str = "info"
     timezone: str = "UTC"
+    synchronous: str = "normal"
     deploy: DeployConfig | None = None
 
 
 def load_config(path: Path | None = None) -> Config:
-    """Load config from watchd.toml. Returns defaults if file missing."""
+    """Load config from watchd.toml. Returns defaults if file missing.
+
+    Parsed results are cached per absolute path and mtime, so repeated calls
+    in one process only re-read the file after it changes. The returned
+    Config is frozen and shared between callers.
+    """
+    config = read_config(path)
+    return Config() if config is None else config
+
+
+def read_config(path: Path | None = None) -> Config | None:
+    """Like load_config, but returns None when the file does not exist."""
     if path is None:
         path = Path.cwd() / "watchd.toml"
-    if not path.exists():
-        return Config()
+    # abspath keeps a relative path from hitting another directory's entry
+    # after a chdir, without the per-component lstat of Path.resolve().
+    abs_path = os.path.abspath(path)
+    try:
+        mtime_ns = os.stat(abs_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_config_cached(abs_path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int) -> Config:
     try:
         with open(path, "rb") as f:
             data = tomllib.load(f)
     except tomllib.TOMLDecodeError as e:
-        print(f"Error in {path.name}: {e}", file=sys.stderr)
+        print(f"Error in {os.path.basename(path)}: {e}", file=sys.stderr)
         sys.exit(1)
     watchd = data.get("watchd", {})
+    synchronous = watchd.get("synchronous", Config.synchronous)
+    if not isinstance(synchronous, str) or synchronous.lower() not in SYNCHRONOUS_MODES:
+        modes = ", ".join(SYNCHRONOUS_MODES)
+        print(
+            f"Error in {os.path.basename(path)}: synchronous must be one of {modes}, got {synchronous!r}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
     deploy = None
     if "deploy" in watchd:
         d = watchd["deploy"]
@@ -52,5 +88,6 @@ def load_config(path: Path | None = None) -> Config:
         agents_dir=watchd.get("agents_dir", Config.agents_dir),
         log_level=watchd.get("log_level", Config.log_level),
         timezone=watchd.get("timezone", Config.timezone),
+        synchronous=synchronous,
         deploy=deploy,
     )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import subprocess
 import sys
 import time
@@ -38,24 +39,59 @@ _RSYNC_EXCLUDES = (
 )
 
 
-def _ssh(host, cmd, check=True):
-    result = subprocess.run(
-        ["ssh", "-o", "BatchMode=yes", "-o", "ConnectTimeout=10", host, cmd],
-        capture_output=True,
-        text=True,
+# Reuse one SSH connection for every command in a deploy instead of
+# paying the handshake and auth per call.
+_SSH_OPTS = tuple(
+    arg
+    for opt in (
+        "BatchMode=yes",
+        "ConnectTimeout=10",
+        "ControlMaster=auto",
+        # %C is a hash of user, host and port, so the socket path stays short.
+        "ControlPath=~/.ssh/cm-%C",
+        "ControlPersist=60s",
     )
+    for arg in ("-o", opt)
+)
+
+# One round trip for the remote preflight checks. Every line prints
+# key=value and the script always exits 0, so a non-zero exit means SSH
+# itself failed.
+_PREFLIGHT_PROBE = """\
+echo "uv=$(command -v uv)"
+echo "systemctl=$(command -v systemctl)"
+loginctl show-user $(whoami) -p Linger 2>/dev/null || echo Linger=unknown
+(mkdir -p {path} && test -w {path}) 2>/dev/null && echo writable=yes || echo writable=no
+"""
+
+
+@functools.cache
+def _ensure_control_dir():
+    (Path.home() / ".ssh").mkdir(mode=0o700, exist_ok=True)
+
+
+def _ssh(host, cmd, check=True):
+    _ensure_control_dir()
+    # Output stays as bytes; most callers only look at the return code.
+    result = subprocess.run(["ssh", *_SSH_OPTS, host, cmd], capture_output=True)
     if check and result.returncode != 0:
-        raise RuntimeError(f"ssh command failed: {cmd}\n{result.stderr.strip()}")
+        raise RuntimeError(f"ssh command failed: {cmd}\n{_text(result.stderr)}")
     return result
 
 
+def _text(output: bytes) -> str:
+    return output.decode(errors="replace").strip()
+
+
 def _rsync(source, host, dest):
-    args = ["rsync", "-az", "--delete"]
+    _ensure_control_dir()
+    args = ["rsync", "-az", "--quiet", "--delete", "-e", " ".join(["ssh", *_SSH_OPTS])]
     for exc in _RSYNC_EXCLUDES:
         args += ["--exclude", exc]
     source_str = str(source).rstrip("/") + "/"
     args += [source_str, f"{host}:{dest}/"]
-    result = subprocess.run(args, capture_output=True, text=True)
+    # stdout passes straight through; only stderr (errors) is kept for the message.
+    result = subprocess.run(args, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"rsync failed:\n{result.stderr.strip()}")
     return result
@@ -85,11 +121,12 @@ def _resolve_deploy_config(config):
 
 def _validate_local(config):
     errors = []
-    if not (Path.cwd() / "watchd.toml").exists():
+    cwd = Path.cwd()
+    if not (cwd / "watchd.toml").exists():
         errors.append("watchd.toml not found")
-    if not (Path.cwd() / "pyproject.toml").exists():
+    if not (cwd / "pyproject.toml").exists():
         errors.append("pyproject.toml not found")
-    agents_dir = Path.cwd() / config.agents_dir
+    agents_dir = cwd / config.agents_dir
     if not agents_dir.is_dir():
         errors.append(f"agents directory '{config.agents_dir}' not found")
     db_path = Path(config.db)
@@ -116,21 +153,38 @@ def preflight(config):
             return False
         return True
 
-    print("Preflight checks:")
-    if not _check("SSH connectivity", lambda: _ssh(dc.host, "echo ok")):
-        return False
+    probe = {}
+
+    def _run_probe():
+        r = _ssh(dc.host, _PREFLIGHT_PROBE.format(path=dc.path))
+        for line in _text(r.stdout).splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                probe[key.strip()] = value.strip()
+
+    def _require(key, message):
+        def check():
+            if not probe.get(key):
+                raise RuntimeError(message)
 
-    _check("uv available", lambda: _ssh(dc.host, "command -v uv"))
-    _check("systemctl available", lambda: _ssh(dc.host, "command -v systemctl"))
+        return check
 
     def _check_linger():
-        r = _ssh(dc.host, "loginctl show-user $(whoami) -p Linger 2>/dev/null || echo Linger=unknown", check=False)
-        out = r.stdout.strip()
-        if "Linger=no" in out:
+        if probe.get("Linger") == "no":
             raise RuntimeError("loginctl linger not enabled, service will stop on logout. Run: loginctl enable-linger")
 
+    def _check_writable():
+        if probe.get("writable") != "yes":
+            raise RuntimeError(f"cannot create or write to {dc.path}")
+
+    print("Preflight checks:")
+    if not _check("SSH connectivity", _run_probe):
+        return False
+
+    _check("uv available", _require("uv", "uv not found on PATH"))
+    _check("systemctl available", _require("systemctl", "systemctl not found on PATH"))
     _check("loginctl linger", _check_linger)
-    _check("deploy path writable", lambda: _ssh(dc.host, f"mkdir -p {dc.path} && test -w {dc.path}"))
+    _check("deploy path writable", _check_writable)
 
     return all_pass
 
@@ -138,6 +192,7 @@ def preflight(config):
 def deploy(config):
     _validate_local(config)
     dc = _resolve_deploy_config(config)
+    cwd = Path.cwd()
 
     print("Running preflight checks...")
     if not preflight(config):
@@ -155,14 +210,21 @@ def deploy(config):
 
     # Rsync project files
     print("  Syncing files...")
-    _rsync(Path.cwd(), dc.host, release_dir)
+    _rsync(cwd, dc.host, release_dir)
 
     # Transfer .env if exists
-    env_path = Path.cwd() / dc.env_file
+    env_path = cwd / dc.env_file
     if env_path.exists():
         print("  Transferring .env...")
         subprocess.run(
-            ["rsync", "-az", str(env_path), f"{dc.host}:{release_dir}/.env"],
+            [
+                "rsync",
+                "-az",
+                "-e",
+                " ".join(["ssh", *_SSH_OPTS]),
+                str(env_path),
+                f"{dc.host}:{release_dir}/.env",
+            ],
             capture_output=True,
             text=True,
             check=True,
@@ -179,7 +241,7 @@ def deploy(config):
     db_parent = str(Path(db_rel).parent)
     if db_parent != ".":
         _ssh(dc.host, f"mkdir -p {release_dir}/{db_parent}")
-    abs_shared = _ssh(dc.host, f"cd {base}/shared && pwd").stdout.strip()
+    abs_shared = _text(_ssh(dc.host, f"cd {base}/shared && pwd").stdout)
     _ssh(dc.host, f"ln -sfn {abs_shared}/{db_name} {release_dir}/{db_rel}")
 
     # Atomic symlink swap
@@ -187,8 +249,8 @@ def deploy(config):
     _ssh(dc.host, f"ln -sfn releases/{ts} {base}/current.tmp && mv -Tf {base}/current.tmp {base}/current")
 
     # Resolve paths for systemd unit
-    abs_path = _ssh(dc.host, f"realpath {base}/current").stdout.strip()
-    uv_path = _ssh(dc.host, "command -v uv").stdout.strip()
+    abs_path = _text(_ssh(dc.host, f"realpath {base}/current").stdout)
+    uv_path = _text(_ssh(dc.host, "command -v uv").stdout)
 
     # Derive service name from remote path basename
     service_base = Path(dc.path.replace("~", "")).name if "~" in dc.path else Path(dc.path).name
@@ -207,12 +269,13 @@ def deploy(config):
     # Status check
     time.sleep(2)
     status = _ssh(dc.host, f"systemctl --user is-active {service_name}", check=False)
-    if status.stdout.strip() == "active":
+    status_text = _text(status.stdout)
+    if status_text == "active":
         print(f"\n  {service_name} is running.")
     else:
-        print(f"\n  Warning: {service_name} status: {status.stdout.strip()}", file=sys.stderr)
+        print(f"\n  Warning: {service_name} status: {status_text}", file=sys.stderr)
         detail = _ssh(dc.host, f"systemctl --user status {service_name}", check=False)
-        print(detail.stdout, file=sys.stderr)
+        print(_text(detail.stdout), file=sys.stderr)
 
     # Prune old releases
     _prune_releases(dc.host, base, dc.keep_releases)
@@ -224,7 +287,7 @@ def _prune_releases(host, base, keep):
     result = _ssh(host, f"ls -1t {base}/releases/", check=False)
     if result.returncode != 0:
         return
-    dirs = [d for d in result.stdout.strip().split("\n") if d]
+    dirs = [d for d in _text(result.stdout).split("\n") if d]
     if len(dirs) <= keep:
         return
     to_remove = dirs[keep:]
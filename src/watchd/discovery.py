@@ -3,23 +3,32 @@
 from __future__ import annotations
 
 import importlib.util
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import structlog
-
 from watchd.agent import Agent
-from watchd.registry import clear_registry, get_registry
+from watchd.registry import _get_log, clear_registry, get_registry, register_agent
+
+# Below this many modules to load, thread start-up costs more than
+# overlapping the source reads saves.
+_PARALLEL_COMPILE_MIN = 32
 
-log = structlog.get_logger()
+# file path -> ((mtime_ns, size), agents it registered) for modules already executed
+_loaded: dict[str, tuple[tuple[int, int], list[Agent]]] = {}
 
 
 def discover_agents(agents_dir: str | Path) -> dict[str, Agent]:
-    """Scan agents_dir for .py files, import them, return registered agents."""
+    """Scan agents_dir for .py files, import them, return registered agents.
+
+    The result is the live registry, not a copy, and the next discovery
+    replaces its contents. Use snapshot_registry() to keep one around.
+    """
     clear_registry()
     agents_path = Path(agents_dir)
     if not agents_path.is_dir():
-        return {}
+        return get_registry()
 
     # Ensure parent is importable
     parent = str(agents_path.parent)
@@ -28,30 +37,79 @@ def discover_agents(agents_dir: str | Path) -> dict[str, Agent]:
 
     dir_name = agents_path.name
 
-    for py_file in sorted(agents_path.glob("*.py")):
-        if py_file.name.startswith("_"):
+    # One directory pass finds both flat agents (name.py) and package agents
+    # (name/agent.py). Flat files load first, each group in name order.
+    flat, nested = [], []
+    with os.scandir(agents_path) as it:
+        for entry in it:
+            if entry.name.startswith("_"):
+                continue
+            if entry.name.endswith(".py") and entry.is_file():
+                flat.append((f"{dir_name}.{entry.name[:-3]}", entry.path, entry.name))
+            elif entry.is_dir():
+                agent_file = os.path.join(entry.path, "agent.py")
+                if os.path.isfile(agent_file):
+                    nested.append((f"{dir_name}.{entry.name}.agent", agent_file, agent_file))
+    # (module name, file path, label for errors), in load order
+    candidates = sorted(flat) + sorted(nested)
+
+    # Modules that are already imported and unchanged on disk are not run
+    # again; the agents they registered last time are replayed instead.
+    plan = []  # (spec, label, stamp, cached agents)
+    for module_name, file_path, label in candidates:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _loaded.get(file_path)
+        module = sys.modules.get(module_name)
+        if cached and cached[0] == stamp and getattr(module, "__file__", None) == file_path:
+            plan.append((None, label, stamp, cached[1]))
             continue
-        module_name = f"{dir_name}.{py_file.stem}"
-        spec = importlib.util.spec_from_file_location(module_name, py_file)
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
         if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            try:
-                spec.loader.exec_module(module)
-            except Exception as e:
-                log.error("agent_load_failed", file=str(py_file.name), error=str(e))
+            plan.append((spec, label, stamp, None))
 
-    for agent_file in sorted(agents_path.glob("*/agent.py")):
-        if agent_file.parent.name.startswith("_"):
+    # With many modules to load, read and compile them concurrently so slow
+    # (cold or network) file reads overlap. Module bodies still execute one
+    # at a time, in order, so registration stays deterministic.
+    specs = [spec for spec, *_ in plan if spec is not None]
+    compiled = {}
+    if len(specs) >= _PARALLEL_COMPILE_MIN:
+        with ThreadPoolExecutor(max_workers=min(32, len(specs))) as pool:
+            compiled = dict(zip((spec.name for spec in specs), pool.map(_compile, specs)))
+
+    registry = get_registry()
+    for spec, label, stamp, cached in plan:
+        if spec is None:
+            for a in cached:
+                register_agent(a)
             continue
-        module_name = f"{dir_name}.{agent_file.parent.name}.agent"
-        spec = importlib.util.spec_from_file_location(module_name, agent_file)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            try:
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        before = dict(registry)
+        try:
+            if spec.name in compiled:
+                code, error = compiled[spec.name]
+                if error is not None:
+                    raise error
+                exec(code, module.__dict__)
+            else:
                 spec.loader.exec_module(module)
-            except Exception as e:
-                log.error("agent_load_failed", file=str(agent_file), error=str(e))
+        except Exception as e:
+            _loaded.pop(spec.origin, None)
+            _get_log().error("agent_load_failed", file=label, error=str(e))
+            continue
+        added = [a for name, a in registry.items() if before.get(name) is not a]
+        _loaded[spec.origin] = (stamp, added)
+
+    return get_registry()
+
 
-    return dict(get_registry())
+def _compile(spec) -> tuple[object | None, Exception | None]:
+    """Read and compile a module's source (or cached bytecode) without running it."""
+    try:
+        return spec.loader.get_code(spec.name), None
+    except Exception as e:
+        return None, e
@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
-import structlog
-
 from watchd.agent import Agent
 from watchd.schedule import Schedule
 
-log = structlog.get_logger()
+_log = None
+
+
+def _get_log():
+    # structlog is only needed on the warning/error paths; keep it off import.
+    global _log
+    if _log is None:
+        import structlog
+
+        _log = structlog.get_logger()
+    return _log
+
 
 _registry: dict[str, Agent] = {}
 
@@ -17,17 +26,26 @@ def agent(schedule: Schedule | None = None, name: str | None = None, retries: in
 
     def decorator(fn):
         agent_name = name or fn.__name__
-        if agent_name in _registry:
-            log.warning("duplicate_agent_name", name=agent_name, replacing=_registry[agent_name].fn)
-        _registry[agent_name] = Agent(name=agent_name, fn=fn, schedule=schedule, retries=retries)
+        register_agent(Agent(name=agent_name, fn=fn, schedule=schedule, retries=retries))
         return fn
 
     return decorator
 
 
+def register_agent(a: Agent):
+    if a.name in _registry:
+        _get_log().warning("duplicate_agent_name", name=a.name, replacing=_registry[a.name].fn)
+    _registry[a.name] = a
+
+
 def get_registry() -> dict[str, Agent]:
     return _registry
 
 
+def snapshot_registry() -> dict[str, Agent]:
+    """Copy of the registry that later registrations and discoveries leave alone."""
+    return dict(_registry)
+
+
 def clear_registry():
     _registry.clear()
@@ -9,12 +9,12 @@ import traceback
 from datetime import datetime, timezone
 from uuid import uuid4
 
-import structlog
-
 from watchd.agent import Agent, AgentContext
 from watchd.store import Run, Store
 
 _local = threading.local()
+_capture_lock = threading.Lock()
+_capture_depth = 0
 _original_stdout = None
 
 
@@ -47,24 +47,34 @@ class _ThreadSafeStream:
         return getattr(self._original, name)
 
 
-def install_capture():
-    """Replace sys.stdout with a thread-safe capturing wrapper."""
-    global _original_stdout
-    if not isinstance(sys.stdout, _ThreadSafeStream):
-        _original_stdout = sys.stdout
-        sys.stdout = _ThreadSafeStream(sys.stdout)
+def _start_capture(buf: io.StringIO):
+    """Capture this thread's stdout into buf until _stop_capture().
 
+    The wrapper is only installed while at least one agent is executing,
+    so prints outside agent runs go straight to the real stream.
+    """
+    global _capture_depth, _original_stdout
+    with _capture_lock:
+        if _capture_depth == 0:
+            _original_stdout = sys.stdout
+            sys.stdout = _ThreadSafeStream(sys.stdout)
+        _capture_depth += 1
+    _local.buf = buf
 
-def uninstall_capture():
-    """Restore the original sys.stdout."""
-    global _original_stdout
-    if _original_stdout is not None:
-        sys.stdout = _original_stdout
-        _original_stdout = None
+
+def _stop_capture():
+    global _capture_depth, _original_stdout
+    _local.buf = None
+    with _capture_lock:
+        _capture_depth -= 1
+        if _capture_depth == 0:
+            if isinstance(sys.stdout, _ThreadSafeStream):
+                sys.stdout = _original_stdout
+            _original_stdout = None
 
 
 def execute_agent(agent: Agent, store: Store) -> Run:
-    install_capture()
+    import structlog
 
     run_id = uuid4().hex[:12]
     log = structlog.get_logger().bind(agent=agent.name, run_id=run_id)
@@ -72,13 +82,13 @@ def execute_agent(agent: Agent, store: Store) -> Run:
 
     now = datetime.now(timezone.utc)
     run = Run(id=run_id, agent=agent.name, status="running", started_at=now)
-    store.save_run(run)
+    store.enqueue_run_update(run)
 
     attempts = 1 + agent.retries
     last_error = None
 
     buf = io.StringIO()
-    _local.buf = buf
+    _start_capture(buf)
 
     try:
         for attempt in range(1, attempts + 1):
@@ -97,18 +107,22 @@ def execute_agent(agent: Agent, store: Store) -> Run:
 
         if last_error:
             run.status = "error"
-            run.error = traceback.format_exception(last_error)[-1].strip()
+            run.error = traceback.format_exception_only(last_error)[-1].strip()
     except BaseException as e:
         run.status = "error"
         run.error = f"{type(e).__name__}: {e}"
         raise
     finally:
-        _local.buf = None
-        ctx.state.flush()
+        _stop_capture()
         run.output = buf.getvalue() or None
         run.finished_at = datetime.now(timezone.utc)
         run.duration_ms = (run.finished_at - run.started_at).total_seconds() * 1000
-        store.update_run(run)
+        # State and the finished run record commit together, unless the
+        # store's writer thread is batching run records.
+        with store.atomic():
+            if ctx._state is not None:
+                ctx._state.flush()
+            store.enqueue_run_update(run)
         log.info("agent_finished", status=run.status, result=run.result, duration_ms=round(run.duration_ms))
 
     return run
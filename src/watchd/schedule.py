@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import re
 from dataclasses import dataclass, field
 
 
@@ -10,19 +12,20 @@ class Schedule:
     trigger_type: str  # "interval" or "cron"
     kwargs: dict = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Schedules are immutable, so the display string is built once.
+        object.__setattr__(self, "_label", self._format())
+
     def to_apscheduler_trigger(self):
-        from apscheduler.triggers.cron import CronTrigger
-        from apscheduler.triggers.interval import IntervalTrigger
+        return _build_trigger(self)
 
-        if self.trigger_type == "interval":
-            return IntervalTrigger(**self.kwargs)
-        if self.trigger_type == "cron":
-            if "crontab" in self.kwargs:
-                return CronTrigger.from_crontab(self.kwargs["crontab"])
-            return CronTrigger(**self.kwargs)
-        raise ValueError(f"Unknown trigger type: {self.trigger_type}")
+    def __hash__(self):
+        return hash((self.trigger_type, frozenset(self.kwargs.items())))
 
     def __str__(self):
+        return self._label
+
+    def _format(self) -> str:
         if self.trigger_type == "interval":
             parts = [f"{v}{k[0]}" for k, v in self.kwargs.items()]
             return f"every {' '.join(parts)}"
@@ -31,9 +34,33 @@ class Schedule:
         return f"cron({self.kwargs})"
 
 
+@functools.cache
+def _trigger_classes():
+    """Import APScheduler's trigger classes on first use only."""
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    return CronTrigger, IntervalTrigger
+
+
+@functools.cache
+def _build_trigger(schedule: Schedule):
+    """Equal schedules share one trigger; APScheduler triggers are immutable."""
+    CronTrigger, IntervalTrigger = _trigger_classes()
+    if schedule.trigger_type == "interval":
+        return IntervalTrigger(**schedule.kwargs)
+    if schedule.trigger_type == "cron":
+        if "crontab" in schedule.kwargs:
+            return CronTrigger.from_crontab(schedule.kwargs["crontab"])
+        return CronTrigger(**schedule.kwargs)
+    raise ValueError(f"Unknown trigger type: {schedule.trigger_type}")
+
+
 class _DayOfWeekBuilder:
     """Intermediate builder for every.monday.at(...) etc."""
 
+    __slots__ = ("_dow",)
+
     def __init__(self, day_of_week: str):
         self._dow = day_of_week
 
@@ -45,6 +72,8 @@ class _DayOfWeekBuilder:
 class _DayBuilder:
     """Intermediate builder for every.day.at(...)."""
 
+    __slots__ = ()
+
     def at(self, time_str: str) -> Schedule:
         hour, minute = _parse_time(time_str)
         return Schedule("cron", {"hour": hour, "minute": minute})
@@ -60,22 +89,23 @@ _DAYS = {
     "sunday": "sun",
 }
 
+# Builders are stateless apart from the weekday, so one instance of each is shared.
+_DAY_BUILDER = _DayBuilder()
+_DAY_OF_WEEK_BUILDERS = {dow: _DayOfWeekBuilder(dow) for dow in _DAYS.values()}
+
 
 class _Every:
     """Module-level singleton providing the fluent schedule API."""
 
+    __slots__ = ()
+
     @property
     def hour(self) -> Schedule:
         return Schedule("interval", {"hours": 1})
 
     @property
     def day(self) -> _DayBuilder:
-        return _DayBuilder()
-
-    def __getattr__(self, name: str):
-        if name in _DAYS:
-            return _DayOfWeekBuilder(_DAYS[name])
-        raise AttributeError(f"'every' has no attribute '{name}'")
+        return _DAY_BUILDER
 
     def minutes(self, n: int) -> Schedule:
         return Schedule("interval", {"minutes": n})
@@ -89,12 +119,24 @@ class _Every:
     def cron(self, expression: str) -> Schedule:
         return Schedule("cron", {"crontab": expression})
 
+    # Plain class attributes, so lookups skip __getattr__ and type checkers see them.
+    monday = _DAY_OF_WEEK_BUILDERS["mon"]
+    tuesday = _DAY_OF_WEEK_BUILDERS["tue"]
+    wednesday = _DAY_OF_WEEK_BUILDERS["wed"]
+    thursday = _DAY_OF_WEEK_BUILDERS["thu"]
+    friday = _DAY_OF_WEEK_BUILDERS["fri"]
+    saturday = _DAY_OF_WEEK_BUILDERS["sat"]
+    sunday = _DAY_OF_WEEK_BUILDERS["sun"]
+
+
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
 
 def _parse_time(time_str: str) -> tuple[int, int]:
-    parts = time_str.split(":")
-    if len(parts) != 2:
+    m = _TIME_RE.fullmatch(time_str)
+    if m is None:
         raise ValueError(f"Expected HH:MM format, got: {time_str}")
-    return int(parts[0]), int(parts[1])
+    return int(m.group(1)), int(m.group(2))
 
 
 every = _Every()
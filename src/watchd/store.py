@@ -3,10 +3,24 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import re
 import sqlite3
 import threading
+import time
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+
+from watchd.config import SYNCHRONOUS_MODES
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "watchd[fast]"
+    orjson = None
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS agents (
@@ -24,13 +38,14 @@ CREATE TABLE IF NOT EXISTS runs (
     result TEXT,
     output TEXT,
     error TEXT,
-    started_at TEXT NOT NULL,
-    finished_at TEXT,
+    started_at REAL NOT NULL,  -- unix epoch, milliseconds
+    finished_at REAL,
     duration_ms REAL,
     created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
 );
 
 CREATE INDEX IF NOT EXISTS idx_runs_agent ON runs(agent, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at DESC);
 
 CREATE TABLE IF NOT EXISTS agent_state (
     agent TEXT NOT NULL REFERENCES agents(name),
@@ -42,7 +57,48 @@ CREATE TABLE IF NOT EXISTS agent_state (
 """
 
 
-@dataclass
+# Databases created before run timestamps moved to epoch ms store them as
+# ISO-8601 TEXT. The table is rebuilt once; rows are converted in Python
+# because SQLite's julianday() loses microseconds.
+_MIGRATE_RUNS_TO_EPOCH = (
+    """CREATE TABLE runs_epoch (
+        id TEXT PRIMARY KEY,
+        agent TEXT NOT NULL REFERENCES agents(name),
+        status TEXT NOT NULL DEFAULT 'running',
+        result TEXT,
+        output TEXT,
+        error TEXT,
+        started_at REAL NOT NULL,
+        finished_at REAL,
+        duration_ms REAL,
+        created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+    )""",
+    "DROP TABLE runs",
+    "ALTER TABLE runs_epoch RENAME TO runs",
+    "CREATE INDEX idx_runs_agent ON runs(agent, started_at DESC)",
+    "CREATE INDEX idx_runs_started ON runs(started_at DESC)",
+)
+
+# Hot-path statements live in module constants so every call hands sqlite3's
+# statement cache the same string.
+_INSERT_RUN = """INSERT INTO runs (id, agent, status, result, output, error, started_at, finished_at, duration_ms)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_UPDATE_RUN = """UPDATE runs SET status=?, result=?, output=?, error=?, finished_at=?, duration_ms=?
+   WHERE id=?"""
+
+_SELECT_AGENT_RUNS = "SELECT * FROM runs WHERE agent=? ORDER BY started_at DESC LIMIT ?"
+_SELECT_ALL_RUNS = "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?"
+
+_SELECT_STATE = "SELECT key, value FROM agent_state WHERE agent=?"
+
+_UPSERT_STATE = """INSERT INTO agent_state (agent, key, value) VALUES (?, ?, ?)
+   ON CONFLICT(agent, key) DO UPDATE SET
+     value = excluded.value,
+     updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"""
+
+
+@dataclass(slots=True)
 class Run:
     id: str
     agent: str
@@ -55,24 +111,180 @@ class Run:
     duration_ms: float | None = None
 
 
+_LONG_DIGITS = re.compile(r"\d{19}")
+
+# Values are always encoded with stdlib json. orjson accepts types json
+# rejects (datetime, UUID, Enum, dataclasses) and writes NaN/Infinity as
+# null, so using it for writes would make stored state depend on whether
+# the extra is installed. Reads are where it pays off anyway: state is
+# loaded on every run but only dirty keys are written.
+_dumps = json.dumps
+
+if orjson is not None:
+
+    def _loads(text: str) -> object:
+        # orjson reads integers wider than 64 bits back as floats.
+        if _LONG_DIGITS.search(text):
+            return json.loads(text)
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # NaN and Infinity are valid for json but not for orjson.
+            return json.loads(text)
+
+else:
+    _loads = json.loads
+
+
+# Idle connections kept per Store for the next thread that needs one.
+_POOL_SIZE = 8
+
+
+class _Lease:
+    """Held in a thread's local storage; returns its connection to the pool when the thread exits."""
+
+    __slots__ = ("release", "__weakref__")
+
+
+def _release(idle: queue.SimpleQueue, c: sqlite3.Connection):
+    if c.in_transaction:
+        c.rollback()
+    if idle.qsize() >= _POOL_SIZE:
+        c.close()
+    else:
+        idle.put(c)
+
+
+_stores: weakref.WeakSet[Store] = weakref.WeakSet()
+# Connections inherited across fork() must never be used or closed by the child.
+_inherited: list = []
+
+
+def _reset_after_fork():
+    for store in _stores:
+        _inherited.append((store._local, store._idle))
+        store._local = threading.local()
+        store._idle = queue.SimpleQueue()
+        # The writer thread does not survive fork(); the child writes synchronously.
+        store._writes = None
+        store._writer = None
+        store._writer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 class Store:
-    def __init__(self, db_path: str):
+    """One SQLite connection per thread, opened in WAL mode.
+
+    When a thread exits its connection goes back to a small pool, so
+    short-lived threads skip connect() and PRAGMA setup. A forked child
+    starts with an empty pool.
+
+    With synchronous=NORMAL a crash or power loss can drop the last few
+    committed transactions, but the database file is never corrupted.
+    Pass synchronous="full" to fsync on every commit instead.
+    """
+
+    def __init__(self, db_path: str, synchronous: str = "normal"):
+        if synchronous.lower() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
         self.db_path = db_path
+        self.synchronous = synchronous.upper()
         self._local = threading.local()
+        self._idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._writes: queue.SimpleQueue | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        _stores.add(self)
 
     @property
     def conn(self) -> sqlite3.Connection:
         c = getattr(self._local, "conn", None)
         if c is None:
-            c = sqlite3.connect(self.db_path)
-            c.row_factory = sqlite3.Row
-            c.execute("PRAGMA journal_mode=WAL")
-            c.execute("PRAGMA foreign_keys=ON")
+            try:
+                c = self._idle.get_nowait()
+            except queue.Empty:
+                c = self._connect()
+            lease = _Lease()
+            lease.release = weakref.finalize(lease, _release, self._idle, c)
+            self._local.lease = lease
             self._local.conn = c
         return c
 
+    def _connect(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one thread holds each at a time.
+        c = sqlite3.connect(self.db_path, cached_statements=256, check_same_thread=False)
+        c.row_factory = sqlite3.Row
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute(f"PRAGMA synchronous={self.synchronous}")
+        c.execute("PRAGMA temp_store=MEMORY")
+        c.execute("PRAGMA cache_size=-65536")
+        c.execute("PRAGMA mmap_size=268435456")
+        c.execute("PRAGMA foreign_keys=ON")
+        return c
+
     def init(self):
         self.conn.executescript(_SCHEMA)
+        if self._runs_use_iso_timestamps():
+            self._migrate_runs_to_epoch()
+
+    def _runs_use_iso_timestamps(self) -> bool:
+        columns = self.conn.execute("PRAGMA table_info(runs)").fetchall()
+        return any(c["name"] == "started_at" and c["type"] == "TEXT" for c in columns)
+
+    def _migrate_runs_to_epoch(self):
+        c = self.conn
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock.
+            if self._runs_use_iso_timestamps():
+                create, *rest = _MIGRATE_RUNS_TO_EPOCH
+                c.execute(create)
+                rows = c.execute(
+                    """SELECT id, agent, status, result, output, error,
+                              started_at, finished_at, duration_ms, created_at FROM runs"""
+                ).fetchall()
+                c.executemany(
+                    "INSERT INTO runs_epoch VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            *tuple(r)[:6],
+                            _iso_to_epoch_ms(r["started_at"]),
+                            _iso_to_epoch_ms(r["finished_at"]),
+                            r["duration_ms"],
+                            r["created_at"],
+                        )
+                        for r in rows
+                    ],
+                )
+                for stmt in rest:
+                    c.execute(stmt)
+            c.commit()
+        except BaseException:
+            c.rollback()
+            raise
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        """Group writes into one transaction. Commits once on exit, rolls back on error.
+
+        Nested calls join the outer transaction.
+        """
+        if getattr(self._local, "atomic", False):
+            yield
+            return
+        self._local.atomic = True
+        try:
+            with self.conn:
+                yield
+        finally:
+            self._local.atomic = False
+
+    def _commit(self):
+        if not getattr(self._local, "atomic", False):
+            self.conn.commit()
 
     def sync_agent(self, name: str, schedule_str: str | None = None, retries: int = 0):
         self.conn.execute(
@@ -83,91 +295,198 @@ class Store:
                  updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')""",
             (name, schedule_str, retries),
         )
-        self.conn.commit()
+        self._commit()
 
     def save_run(self, run: Run):
-        self.conn.execute(
-            """INSERT INTO runs (id, agent, status, result, output, error, started_at, finished_at, duration_ms)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                run.id,
-                run.agent,
-                run.status,
-                run.result,
-                run.output,
-                run.error,
-                _to_iso(run.started_at),
-                _to_iso(run.finished_at),
-                run.duration_ms,
-            ),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_RUN, _run_params(run))
+        self._commit()
 
     def update_run(self, run: Run):
-        self.conn.execute(
-            """UPDATE runs SET status=?, result=?, output=?, error=?, finished_at=?, duration_ms=?
-               WHERE id=?""",
-            (
-                run.status,
-                run.result,
-                run.output,
-                run.error,
-                _to_iso(run.finished_at),
-                run.duration_ms,
-                run.id,
-            ),
-        )
-        self.conn.commit()
+        """Write the final state of a run, inserting it if save_run never landed."""
+        _write_run(self.conn, _run_params(run))
+        self._commit()
+
+    def start_writer(self, max_batch: int = 64, max_delay: float = 0.05):
+        """Persist runs passed to enqueue_run_update from a background thread.
+
+        The writer collects up to max_batch runs or waits max_delay seconds,
+        then writes them in one transaction. A crash can lose runs still in
+        the queue, on top of what synchronous=NORMAL already allows.
+        """
+        with self._writer_lock:
+            if self._writer is not None:
+                return
+            self._writes = queue.SimpleQueue()
+            self._writer = threading.Thread(
+                target=self._write_behind,
+                args=(self._writes, max_batch, max_delay),
+                name="watchd-store-writer",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def stop_writer(self):
+        """Write everything still queued, then stop the writer thread."""
+        with self._writer_lock:
+            writes, writer = self._writes, self._writer
+            self._writes = self._writer = None
+            if writes is not None:
+                writes.put(None)
+        if writer is not None:
+            writer.join()
+
+    def flush_writes(self):
+        """Block until every run queued so far has been written."""
+        with self._writer_lock:
+            if self._writes is None:
+                return
+            writer = self._writer
+            done = threading.Event()
+            self._writes.put(done)
+        while not done.wait(0.1):
+            if not writer.is_alive():
+                raise RuntimeError("store writer thread died with runs still queued")
+
+    def enqueue_run_update(self, run: Run):
+        """Like update_run, but hands the write to the writer thread when it is running."""
+        with self._writer_lock:
+            if self._writes is not None and self._writer.is_alive():
+                self._writes.put(_run_params(run))
+                return
+        self.update_run(run)
+
+    def _write_behind(self, writes: queue.SimpleQueue, max_batch: int, max_delay: float):
+        stop = False
+        while not stop:
+            batch: dict[str, tuple] = {}  # run id -> latest params
+            waiters: list[threading.Event] = []
+            item = writes.get()
+            deadline = time.monotonic() + max_delay
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch[item[0]] = item
+                timeout = deadline - time.monotonic()
+                if len(batch) >= max_batch or timeout <= 0:
+                    break
+                try:
+                    item = writes.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_runs(list(batch.values()))
+            for w in waiters:
+                w.set()
+
+    def _write_runs(self, params: list[tuple]):
+        c = self.conn
+        try:
+            c.execute("BEGIN IMMEDIATE")
+            for p in params:
+                _write_run(c, p)
+            c.commit()
+            return
+        except sqlite3.Error:
+            if c.in_transaction:
+                c.rollback()
+        # Write the batch one run at a time so a bad row, or a lock that
+        # outlasted the busy timeout, only costs the runs that still fail.
+        for p in params:
+            try:
+                _write_run(c, p)
+                c.commit()
+            except sqlite3.Error as e:
+                if c.in_transaction:
+                    c.rollback()
+                import structlog
+
+                structlog.get_logger().error("run_write_failed", run_id=p[0], error=str(e))
 
     def get_run(self, run_id: str) -> Run | None:
         row = self.conn.execute("SELECT * FROM runs WHERE id=?", (run_id,)).fetchone()
         return _row_to_run(row) if row else None
 
+    def iter_runs(self, agent_name: str | None = None, limit: int = 20) -> Iterator[Run]:
+        """Newest runs first, decoded one row at a time as the caller iterates."""
+        if agent_name:
+            cur = self.conn.execute(_SELECT_AGENT_RUNS, (agent_name, limit))
+        else:
+            cur = self.conn.execute(_SELECT_ALL_RUNS, (limit,))
+        for row in cur:
+            yield _row_to_run(row)
+
     def get_runs(self, agent_name: str, limit: int = 20) -> list[Run]:
-        rows = self.conn.execute(
-            "SELECT * FROM runs WHERE agent=? ORDER BY started_at DESC LIMIT ?",
-            (agent_name, limit),
-        ).fetchall()
-        return [_row_to_run(r) for r in rows]
+        return list(self.iter_runs(agent_name, limit))
 
     def get_all_runs(self, limit: int = 20) -> list[Run]:
-        rows = self.conn.execute(
-            "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)
-        ).fetchall()
-        return [_row_to_run(r) for r in rows]
+        return list(self.iter_runs(limit=limit))
+
+    def get_runs_formatted(
+        self, agent_name: str | None = None, limit: int = 20
+    ) -> list[tuple[str, str, str, str, str]]:
+        """(id, agent, status, duration, started) rows, formatted for display.
+
+        SQLite formats the start time; the duration is formatted in Python so
+        it rounds the same way as the CLI's per-run output.
+        """
+        where = "WHERE agent=?" if agent_name else ""
+        params = (agent_name, limit) if agent_name else (limit,)
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(
+            f"""SELECT id, agent, status, duration_ms,
+                  COALESCE(strftime('%Y-%m-%d %H:%M:%S', started_at / 1000, 'unixepoch'), '-')
+                FROM runs {where} ORDER BY started_at DESC LIMIT ?""",
+            params,
+        )
+        return [
+            (run_id, agent, status, f"{ms:.0f}ms" if ms else "-", started)
+            for run_id, agent, status, ms, started in rows
+        ]
 
     def get_state(self, agent_name: str) -> dict[str, object]:
-        rows = self.conn.execute(
-            "SELECT key, value FROM agent_state WHERE agent=?", (agent_name,)
-        ).fetchall()
-        return {r["key"]: json.loads(r["value"]) for r in rows}
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        return {key: _loads(value) for key, value in cur.execute(_SELECT_STATE, (agent_name,))}
 
     def set_state(self, agent_name: str, key: str, value: object):
         self.conn.execute(
-            """INSERT INTO agent_state (agent, key, value) VALUES (?, ?, ?)
-               ON CONFLICT(agent, key) DO UPDATE SET
-                 value = excluded.value,
-                 updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')""",
-            (agent_name, key, json.dumps(value)),
+            _UPSERT_STATE,
+            (agent_name, key, _dumps(value)),
         )
-        self.conn.commit()
+        self._commit()
 
     def set_state_bulk(self, agent_name: str, data: dict[str, object]):
-        with self.conn:
-            for key, value in data.items():
-                self.conn.execute(
-                    """INSERT INTO agent_state (agent, key, value) VALUES (?, ?, ?)
-                       ON CONFLICT(agent, key) DO UPDATE SET
-                         value = excluded.value,
-                         updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')""",
-                    (agent_name, key, json.dumps(value)),
-                )
+        with self.atomic():
+            self.conn.executemany(
+                _UPSERT_STATE,
+                [(agent_name, key, _dumps(value)) for key, value in data.items()],
+            )
 
     def delete_state_keys(self, agent_name: str, keys: set[str]):
-        with self.conn:
-            for key in keys:
+        with self.atomic():
+            self.conn.executemany(
+                "DELETE FROM agent_state WHERE agent=? AND key=?",
+                [(agent_name, key) for key in keys],
+            )
+
+    def flush_state(self, agent_name: str, dirty: dict[str, object], deleted: set[str]):
+        """Apply deletes and upserts for one agent in a single transaction."""
+        with self.atomic():
+            if deleted:
+                placeholders = ", ".join("?" * len(deleted))
                 self.conn.execute(
-                    "DELETE FROM agent_state WHERE agent=? AND key=?", (agent_name, key)
+                    f"DELETE FROM agent_state WHERE agent=? AND key IN ({placeholders})",
+                    (agent_name, *deleted),
+                )
+            if dirty:
+                self.conn.executemany(
+                    _UPSERT_STATE,
+                    [(agent_name, key, _dumps(value)) for key, value in dirty.items()],
                 )
 
     def get_all_agents(self) -> list[dict]:
@@ -175,16 +494,49 @@ class Store:
         return [dict(r) for r in rows]
 
     def close(self):
+        """Stop the writer, then close this thread's connection and any idle pooled ones."""
+        self.stop_writer()
         c = getattr(self._local, "conn", None)
         if c:
+            self._local.lease.release.detach()
             c.close()
             self._local.conn = None
+            self._local.lease = None
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
 
 
-def _to_iso(dt: datetime | None) -> str | None:
+def _to_epoch_ms(dt: datetime | None) -> float | None:
     if dt is None:
         return None
-    return dt.isoformat()
+    if dt.tzinfo is None:
+        # Naive timestamps are UTC, never local time.
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp() * 1000
+
+
+def _run_params(run: Run) -> tuple:
+    return (
+        run.id,
+        run.agent,
+        run.status,
+        run.result,
+        run.output,
+        run.error,
+        _to_epoch_ms(run.started_at),
+        _to_epoch_ms(run.finished_at),
+        run.duration_ms,
+    )
+
+
+def _write_run(c: sqlite3.Connection, params: tuple):
+    # UPDATE first so finishing a saved run needs only its mutable columns;
+    # the INSERT (which needs started_at) is the rare missing-row case.
+    if c.execute(_UPDATE_RUN, (*params[2:6], *params[7:], params[0])).rowcount == 0:
+        c.execute(_INSERT_RUN, params)
 
 
 def _row_to_run(row: sqlite3.Row) -> Run:
@@ -195,13 +547,19 @@ def _row_to_run(row: sqlite3.Row) -> Run:
         result=row["result"],
         output=row["output"],
         error=row["error"],
-        started_at=_parse_iso(row["started_at"]),
-        finished_at=_parse_iso(row["finished_at"]),
+        started_at=_from_epoch_ms(row["started_at"]),
+        finished_at=_from_epoch_ms(row["finished_at"]),
         duration_ms=row["duration_ms"],
     )
 
 
-def _parse_iso(s: str | None) -> datetime | None:
+def _iso_to_epoch_ms(s: str | None) -> float | None:
     if s is None:
         return None
-    return datetime.fromisoformat(s)
+    return _to_epoch_ms(datetime.fromisoformat(s))
+
+
+def _from_epoch_ms(ms: float | None) -> datetime | None:
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000, timezone.utc)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+import pytest
+
+from watchd.agent import StateProxy
+from watchd.store import Store
+
+
+@pytest.fixture
+def store():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    s = Store(path)
+    s.init()
+    s.sync_agent("agent1")
+    yield s
+    s.close()
+    os.unlink(path)
+
+
+def test_reads_persisted_state(store):
+    store.set_state_bulk("agent1", {"a": 1, "b": 2})
+    state = StateProxy(store, "agent1")
+    assert state["a"] == 1
+    assert dict(state) == {"a": 1, "b": 2}
+    assert len(state) == 2
+
+
+def test_writes_overlay_then_flush(store):
+    store.set_state("agent1", "a", 1)
+    state = StateProxy(store, "agent1")
+    state["a"] = 10
+    state["b"] = 2
+    assert state["a"] == 10
+    assert len(state) == 2
+    assert store.get_state("agent1") == {"a": 1}
+
+    state.flush()
+    assert store.get_state("agent1") == {"a": 10, "b": 2}
+    assert dict(state) == {"a": 10, "b": 2}
+
+
+def test_delete(store):
+    store.set_state_bulk("agent1", {"a": 1, "b": 2})
+    state = StateProxy(store, "agent1")
+    del state["a"]
+    assert "a" not in state
+    assert len(state) == 1
+    with pytest.raises(KeyError):
+        del state["a"]
+
+    state.flush()
+    assert store.get_state("agent1") == {"b": 2}
+
+
+def test_delete_then_set(store):
+    store.set_state("agent1", "a", 1)
+    state = StateProxy(store, "agent1")
+    del state["a"]
+    state["a"] = 5
+    assert state["a"] == 5
+    assert len(state) == 1
+
+    state.flush()
+    assert store.get_state("agent1") == {"a": 5}
+
+
+def test_write_without_read_flushes(store):
+    store.set_state("agent1", "keep", True)
+    state = StateProxy(store, "agent1")
+    state["new"] = "x"
+    state.flush()
+    assert store.get_state("agent1") == {"keep": True, "new": "x"}
@@ -94,6 +94,16 @@ def test_cli_state(app_dir):
     assert '"count": 1' in r.stdout
 
 
+def test_cli_app_reports_real_import_error(tmp_path):
+    pkg = tmp_path / "mypkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("import not_installed_dep\n")
+    (pkg / "app.py").write_text("")
+    r = _run_cli(tmp_path, "list", "--app", "mypkg.app:app")
+    assert r.returncode != 0
+    assert "not_installed_dep" in r.stderr
+
+
 # --- Init / new commands ---
 
 
@@ -120,6 +130,14 @@ def test_cli_new(tmp_path):
     assert "Created" in r.stdout
 
 
+def test_cli_new_renders_name(tmp_path):
+    _run_cli(tmp_path, "init")
+    _run_cli(tmp_path, "new", "fetcher")
+    source = (tmp_path / "watchd_agents" / "fetcher.py").read_text()
+    assert "def fetcher(ctx):" in source
+    assert "{name}" not in source
+
+
 def test_cli_new_already_exists(tmp_path):
     _run_cli(tmp_path, "init")
     _run_cli(tmp_path, "new", "fetcher")
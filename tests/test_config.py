@@ -1,6 +1,10 @@
+import dataclasses
+import os
+from pathlib import Path
+
 import pytest
 
-from watchd.config import Config, load_config
+from watchd.config import Config, load_config, read_config
 
 
 def test_defaults():
@@ -9,6 +13,7 @@ def test_defaults():
     assert c.agents_dir == "watchd_agents"
     assert c.log_level == "info"
     assert c.timezone == "UTC"
+    assert c.synchronous == "normal"
 
 
 def test_load_missing_file(tmp_path):
@@ -90,3 +95,67 @@ def test_no_deploy_section(tmp_path):
     toml.write_text("[watchd]\n")
     c = load_config(toml)
     assert c.deploy is None
+
+
+def test_synchronous_override(tmp_path):
+    toml = tmp_path / "watchd.toml"
+    toml.write_text('[watchd]\nsynchronous = "full"\n')
+    c = load_config(toml)
+    assert c.synchronous == "full"
+
+
+@pytest.mark.parametrize("value", ['"fast"', "1"])
+def test_invalid_synchronous_exits(tmp_path, capsys, value):
+    toml = tmp_path / "watchd.toml"
+    toml.write_text(f"[watchd]\nsynchronous = {value}\n")
+    with pytest.raises(SystemExit):
+        load_config(toml)
+    assert "synchronous must be one of" in capsys.readouterr().err
+
+
+def test_reload_after_change(tmp_path):
+    toml = tmp_path / "watchd.toml"
+    toml.write_text('[watchd]\ndb = "./first.db"\n')
+    assert load_config(toml).db == "./first.db"
+    assert load_config(toml) is load_config(toml)
+
+    toml.write_text('[watchd]\ndb = "./second.db"\n')
+    st = toml.stat()
+    os.utime(toml, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_config(toml).db == "./second.db"
+
+
+def test_loaded_config_is_frozen(tmp_path):
+    toml = tmp_path / "watchd.toml"
+    toml.write_text('[watchd]\ndb = "./first.db"\n[watchd.deploy]\nhost = "u@h"\n')
+    c = load_config(toml)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        c.db = "./other.db"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        c.deploy.host = "other"
+
+
+def test_relative_path_cache_follows_cwd(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "watchd.toml").write_text(f'[watchd]\ndb = "./{name}.db"\n')
+    monkeypatch.chdir(tmp_path / "a")
+    assert load_config(Path("watchd.toml")).db == "./a.db"
+    monkeypatch.chdir(tmp_path / "b")
+    assert load_config(Path("watchd.toml")).db == "./b.db"
+
+
+def test_read_config_missing_returns_none(tmp_path):
+    assert read_config(tmp_path / "watchd.toml") is None
+
+
+def test_load_stats_file_once(tmp_path, monkeypatch):
+    toml = tmp_path / "watchd.toml"
+    toml.write_text('[watchd]\ndb = "./x.db"\n')
+    calls = []
+    real_stat, real_lstat = os.stat, os.lstat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **kw: calls.append(p) or real_stat(p, *a, **kw))
+    monkeypatch.setattr(os, "lstat", lambda p, *a, **kw: calls.append(p) or real_lstat(p, *a, **kw))
+    assert load_config(toml).db == "./x.db"
+    assert load_config(toml).db == "./x.db"
+    assert len(calls) == 2
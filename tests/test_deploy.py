@@ -15,22 +15,37 @@ from watchd.deploy import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _no_control_dir(monkeypatch):
+    """Keep _ssh/_rsync from creating ~/.ssh in the real home directory."""
+    monkeypatch.setattr("watchd.deploy._ensure_control_dir", lambda: None)
+
+
 def _ok(stdout="", stderr=""):
     r = MagicMock(spec=subprocess.CompletedProcess)
     r.returncode = 0
-    r.stdout = stdout
-    r.stderr = stderr
+    r.stdout = stdout.encode()
+    r.stderr = stderr.encode()
     return r
 
 
 def _fail(stderr="error"):
     r = MagicMock(spec=subprocess.CompletedProcess)
     r.returncode = 1
-    r.stdout = ""
-    r.stderr = stderr
+    r.stdout = b""
+    r.stderr = stderr.encode()
     return r
 
 
+def _probe(linger="yes", writable="yes"):
+    return _ok(
+        "uv=/home/user/.local/bin/uv\n"
+        "systemctl=/usr/bin/systemctl\n"
+        f"Linger={linger}\n"
+        f"writable={writable}\n"
+    )
+
+
 # --- resolve_deploy_config ---
 
 
@@ -116,7 +131,7 @@ def test_validate_local_missing_agents_dir(tmp_path, monkeypatch):
 
 @patch("watchd.deploy.subprocess.run")
 def test_preflight_all_pass(mock_run):
-    mock_run.return_value = _ok("ok\n")
+    mock_run.return_value = _probe()
     dc = DeployConfig(host="u@host", path="~/myapp")
     config = Config(deploy=dc)
     assert preflight(config) is True
@@ -130,15 +145,36 @@ def test_preflight_ssh_fails(mock_run):
     assert preflight(config) is False
 
 
+@patch("watchd.deploy.subprocess.run")
+def test_preflight_single_ssh_call(mock_run):
+    mock_run.return_value = _probe()
+    dc = DeployConfig(host="u@host", path="~/myapp")
+    config = Config(deploy=dc)
+    preflight(config)
+    assert mock_run.call_count == 1
+    args = mock_run.call_args[0][0]
+    assert "ControlMaster=auto" in args
+
+
 @patch("watchd.deploy.subprocess.run")
 def test_preflight_linger_warning(mock_run):
-    def side_effect(args, **kwargs):
-        cmd = args[-1] if args else ""
-        if "loginctl" in cmd:
-            return _ok("Linger=no")
-        return _ok("ok\n")
+    mock_run.return_value = _probe(linger="no")
+    dc = DeployConfig(host="u@host", path="~/myapp")
+    config = Config(deploy=dc)
+    assert preflight(config) is False
+
+
+@patch("watchd.deploy.subprocess.run")
+def test_preflight_missing_uv(mock_run):
+    mock_run.return_value = _ok("uv=\nsystemctl=/usr/bin/systemctl\nLinger=yes\nwritable=yes\n")
+    dc = DeployConfig(host="u@host", path="~/myapp")
+    config = Config(deploy=dc)
+    assert preflight(config) is False
 
-    mock_run.side_effect = side_effect
+
+@patch("watchd.deploy.subprocess.run")
+def test_preflight_path_not_writable(mock_run):
+    mock_run.return_value = _probe(writable="no")
     dc = DeployConfig(host="u@host", path="~/myapp")
     config = Config(deploy=dc)
     assert preflight(config) is False
@@ -180,6 +216,8 @@ def _make_tracker():
     def track_run(args, **kwargs):
         cmd = " ".join(str(a) for a in args)
         calls.append(cmd)
+        if "writable=" in cmd:
+            return _probe()
         if "realpath" in cmd:
             return _ok("/home/user/myapp/releases/123\n")
         if "command -v uv" in cmd:
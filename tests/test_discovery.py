@@ -1,3 +1,5 @@
+import os
+
 from watchd.discovery import discover_agents
 from watchd.registry import clear_registry
 
@@ -139,3 +141,64 @@ def test_directory_without_agent_py(tmp_path):
 
     agents = discover_agents(agents_dir)
     assert agents == {}
+
+
+def test_load_order_is_sorted(tmp_path):
+    agents_dir = tmp_path / "watchd_agents"
+    agents_dir.mkdir()
+    names = ["delta", "alpha", "echo", "charlie", "bravo"]
+    for n in names:
+        (agents_dir / f"{n}.py").write_text(
+            f"from watchd import agent\n\n@agent()\ndef {n}(ctx):\n    pass\n"
+        )
+
+    agents = discover_agents(agents_dir)
+    assert list(agents) == sorted(names)
+
+
+def test_dot_prefixed_entries_are_loaded(tmp_path):
+    agents_dir = tmp_path / "watchd_agents"
+    hidden = agents_dir / ".cache"
+    hidden.mkdir(parents=True)
+    (hidden / "agent.py").write_text(
+        "from watchd import agent\n\n@agent()\ndef cached(ctx):\n    pass\n"
+    )
+    (agents_dir / ".scratch.py").write_text(
+        "from watchd import agent\n\n@agent()\ndef scratch(ctx):\n    pass\n"
+    )
+
+    agents = discover_agents(agents_dir)
+    assert set(agents) == {"cached", "scratch"}
+
+
+def test_rediscover_skips_unchanged_modules(tmp_path):
+    agents_dir = tmp_path / "watchd_agents"
+    agents_dir.mkdir()
+    path = agents_dir / "hello.py"
+    path.write_text("from watchd import agent\n\n@agent()\ndef hello(ctx):\n    return 1\n")
+
+    first = discover_agents(agents_dir)["hello"]
+    second = discover_agents(agents_dir)["hello"]
+    assert second is first
+
+    path.write_text("from watchd import agent\n\n@agent()\ndef hello(ctx):\n    return 2\n")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    third = discover_agents(agents_dir)["hello"]
+    assert third is not first
+    assert third.fn(None) == 2
+
+
+def test_parallel_compile_keeps_order_and_skips_broken(tmp_path, monkeypatch):
+    monkeypatch.setattr("watchd.discovery._PARALLEL_COMPILE_MIN", 0)
+    agents_dir = tmp_path / "watchd_agents"
+    agents_dir.mkdir()
+    names = ["delta", "alpha", "charlie"]
+    for n in names:
+        (agents_dir / f"{n}.py").write_text(
+            f"from watchd import agent\n\n@agent()\ndef {n}(ctx):\n    pass\n"
+        )
+    (agents_dir / "bravo.py").write_text("def broken(:\n")
+
+    agents = discover_agents(agents_dir)
+    assert list(agents) == sorted(names)
@@ -1,4 +1,4 @@
-from watchd.registry import agent, clear_registry, get_registry
+from watchd.registry import agent, clear_registry, get_registry, snapshot_registry
 from watchd.schedule import every
 
 
@@ -56,3 +56,14 @@ def test_duplicate_name_overwrites_with_warning():
 
     reg = get_registry()
     assert reg["dup"].fn is second
+
+
+def test_snapshot_is_detached():
+    @agent()
+    def kept(ctx):
+        pass
+
+    snap = snapshot_registry()
+    clear_registry()
+    assert "kept" in snap
+    assert "kept" not in get_registry()
@@ -42,7 +42,7 @@ def test_execute_error(store):
     agent = Agent(name="test", fn=failing_fn, schedule=None)
     run = execute_agent(agent, store)
     assert run.status == "error"
-    assert "boom" in run.error
+    assert run.error == "ValueError: boom"
 
 
 def test_execute_baseexception_still_updates_run(store):
@@ -155,3 +155,26 @@ def test_no_output_is_none(store):
     agent = Agent(name="test", fn=lambda ctx: "quiet", schedule=None)
     run = execute_agent(agent, store)
     assert run.output is None
+
+
+def test_stdout_restored_after_run(store):
+    import sys
+
+    store.sync_agent("test")
+    original = sys.stdout
+    agent = Agent(name="test", fn=lambda ctx: print("inside"), schedule=None)
+    run = execute_agent(agent, store)
+    assert "inside" in run.output
+    assert sys.stdout is original
+
+
+def test_execute_with_write_behind(store):
+    store.sync_agent("test")
+    store.start_writer()
+
+    agent = Agent(name="test", fn=lambda ctx: "ok", schedule=None)
+    run = execute_agent(agent, store)
+    store.flush_writes()
+    saved = store.get_run(run.id)
+    assert saved.status == "success"
+    assert saved.result == "ok"
@@ -1,3 +1,5 @@
+import pytest
+
 from watchd.schedule import Schedule, every
 
 
@@ -58,3 +60,26 @@ def test_str_interval():
 
 def test_str_cron():
     assert "cron" in str(every.cron("0 * * * *"))
+
+
+def test_trigger_shared_by_equal_schedules():
+    assert hash(every.minutes(15)) == hash(every.minutes(15))
+    assert every.minutes(15).to_apscheduler_trigger() is every.minutes(15).to_apscheduler_trigger()
+    assert (
+        every.minutes(15).to_apscheduler_trigger() is not every.minutes(16).to_apscheduler_trigger()
+    )
+    assert str(every.minutes(15)) == "every 15m"
+
+
+def test_every_weekdays():
+    assert every.sunday.at("07:15") == Schedule(
+        "cron", {"day_of_week": "sun", "hour": 7, "minute": 15}
+    )
+    with pytest.raises(AttributeError):
+        every.funday
+
+
+@pytest.mark.parametrize("bad", ["9", "09:00:00", "9:5", "ab:cd", "09:00\n"])
+def test_at_rejects_bad_time(bad):
+    with pytest.raises(ValueError):
+        every.day.at(bad)
@@ -1,5 +1,7 @@
+import math
 import os
 import tempfile
+import uuid
 from datetime import datetime, timezone
 
 import pytest
@@ -28,6 +30,25 @@ def test_init_creates_tables(store):
     assert "agent_state" in names
 
 
+def test_connection_pragmas(store):
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert store.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert store.conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+    assert store.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_synchronous_full(tmp_path):
+    s = Store(str(tmp_path / "full.db"), synchronous="full")
+    assert s.conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    s.close()
+
+
+def test_invalid_synchronous(tmp_path):
+    with pytest.raises(ValueError):
+        Store(str(tmp_path / "bad.db"), synchronous="sometimes")
+
+
 def test_sync_agent(store):
     store.sync_agent("test_agent", "every 1h", 2)
     agents = store.get_all_agents()
@@ -70,6 +91,27 @@ def test_update_run(store):
     assert runs[0].duration_ms == 150.0
 
 
+def test_update_run_without_save(store):
+    store.sync_agent("agent1")
+    now = datetime.now(timezone.utc)
+    run = Run(id="late", agent="agent1", status="success", started_at=now, finished_at=now)
+    store.update_run(run)
+    found = store.get_run("late")
+    assert found is not None
+    assert found.status == "success"
+    assert found.started_at == now
+
+
+def test_update_run_without_started_at(store):
+    store.sync_agent("agent1")
+    now = datetime.now(timezone.utc)
+    store.save_run(Run(id="r1", agent="agent1", started_at=now))
+    store.update_run(Run(id="r1", agent="agent1", status="success"))
+    found = store.get_run("r1")
+    assert found.status == "success"
+    assert found.started_at == now
+
+
 def test_state_get_set(store):
     store.sync_agent("agent1")
     store.set_state("agent1", "count", 42)
@@ -121,3 +163,240 @@ def test_delete_state_keys(store):
     store.delete_state_keys("agent1", {"a", "c"})
     state = store.get_state("agent1")
     assert state == {"b": 2}
+
+
+def test_flush_state(store):
+    store.sync_agent("agent1")
+    store.set_state_bulk("agent1", {"a": 1, "b": 2, "c": 3})
+    store.flush_state("agent1", {"b": 20, "d": [4]}, {"a", "c"})
+    state = store.get_state("agent1")
+    assert state == {"b": 20, "d": [4]}
+
+
+def test_atomic_commits_together(store):
+    store.sync_agent("agent1")
+    now = datetime.now(timezone.utc)
+    store.save_run(Run(id="r1", agent="agent1", started_at=now))
+    with pytest.raises(RuntimeError):
+        with store.atomic():
+            store.flush_state("agent1", {"a": 1}, set())
+            store.update_run(Run(id="r1", agent="agent1", status="success", finished_at=now))
+            raise RuntimeError("boom")
+    assert store.get_state("agent1") == {}
+    assert store.get_run("r1").status == "running"
+
+    with store.atomic():
+        store.flush_state("agent1", {"a": 1}, set())
+        store.update_run(Run(id="r1", agent="agent1", status="success", finished_at=now))
+    assert store.get_state("agent1") == {"a": 1}
+    assert store.get_run("r1").status == "success"
+
+
+def test_state_json_round_trip(store):
+    store.sync_agent("agent1")
+    store.set_state_bulk(
+        "agent1", {"big": 2**70 + 1, "keys": {1: "one"}, "nested": {"x": [1.5, None]}}
+    )
+    state = store.get_state("agent1")
+    assert state == {"big": 2**70 + 1, "keys": {"1": "one"}, "nested": {"x": [1.5, None]}}
+
+
+def test_state_non_finite_floats(store):
+    store.sync_agent("agent1")
+    store.set_state_bulk("agent1", {"nan": float("nan"), "inf": float("inf"), "ninf": -math.inf})
+    state = store.get_state("agent1")
+    assert math.isnan(state["nan"])
+    assert state["inf"] == math.inf
+    assert state["ninf"] == -math.inf
+
+
+def test_state_reads_legacy_nan_rows(store):
+    store.sync_agent("agent1")
+    store.conn.execute(
+        "INSERT INTO agent_state (agent, key, value) VALUES ('agent1', 'x', '[NaN, Infinity]')"
+    )
+    store.conn.commit()
+    x = store.get_state("agent1")["x"]
+    assert math.isnan(x[0]) and x[1] == math.inf
+
+
+@pytest.mark.parametrize("value", [datetime(2026, 1, 1), uuid.uuid4()])
+def test_state_rejects_non_json_types(store, value):
+    store.sync_agent("agent1")
+    with pytest.raises(TypeError):
+        store.set_state("agent1", "x", value)
+
+
+def test_run_queries_use_indexes(store):
+    plan = store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM runs ORDER BY started_at DESC LIMIT 20"
+    ).fetchall()
+    assert any("idx_runs_started" in r["detail"] for r in plan)
+    plan = store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE agent=? ORDER BY started_at DESC LIMIT 20",
+        ("a1",),
+    ).fetchall()
+    assert any("idx_runs_agent" in r["detail"] for r in plan)
+
+
+def test_get_runs_formatted(store):
+    store.sync_agent("a1")
+    store.sync_agent("a2")
+    started = datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    store.save_run(
+        Run(id="r1", agent="a1", status="success", started_at=started, duration_ms=150.4)
+    )
+    store.save_run(Run(id="r2", agent="a2", status="running", started_at=started))
+    assert store.get_runs_formatted("a1") == [
+        ("r1", "a1", "success", "150ms", "2026-01-02 03:04:05")
+    ]
+    rows = store.get_runs_formatted(limit=10)
+    assert {r[0] for r in rows} == {"r1", "r2"}
+    assert [r for r in rows if r[0] == "r2"][0][3] == "-"
+
+
+def test_get_runs_formatted_rounds_like_python(store):
+    store.sync_agent("a1")
+    started = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    store.save_run(Run(id="r1", agent="a1", started_at=started, duration_ms=12.5))
+    store.save_run(Run(id="r2", agent="a1", started_at=started, duration_ms=0.5))
+    durations = {r[0]: r[3] for r in store.get_runs_formatted("a1")}
+    assert durations == {"r1": f"{12.5:.0f}ms", "r2": f"{0.5:.0f}ms"}
+
+
+def test_migrates_iso_run_timestamps(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE agents (name TEXT PRIMARY KEY, schedule TEXT, retries INTEGER DEFAULT 0,
+                             created_at TEXT, updated_at TEXT);
+        CREATE TABLE runs (id TEXT PRIMARY KEY, agent TEXT NOT NULL REFERENCES agents(name),
+                           status TEXT NOT NULL DEFAULT 'running', result TEXT, output TEXT,
+                           error TEXT, started_at TEXT NOT NULL, finished_at TEXT,
+                           duration_ms REAL, created_at TEXT);
+        INSERT INTO agents (name) VALUES ('a1');
+        INSERT INTO runs (id, agent, status, started_at, finished_at, duration_ms)
+        VALUES ('old', 'a1', 'success', '2026-01-02T03:04:05.250000+00:00',
+                '2026-01-02T03:04:06.500000+00:00', 1250.0);
+        """
+    )
+    conn.close()
+
+    s = Store(path)
+    s.init()
+    run = s.get_run("old")
+    assert run.started_at == datetime(2026, 1, 2, 3, 4, 5, 250000, tzinfo=timezone.utc)
+    assert run.finished_at == datetime(2026, 1, 2, 3, 4, 6, 500000, tzinfo=timezone.utc)
+    assert s.get_runs_formatted("a1")[0][4] == "2026-01-02 03:04:05"
+
+    s.save_run(Run(id="new", agent="a1", started_at=datetime.now(timezone.utc)))
+    assert [r.id for r in s.get_all_runs()] == ["new", "old"]
+    s.init()  # already migrated, no-op
+    assert len(s.get_all_runs()) == 2
+    s.close()
+
+
+def test_connection_reused_after_thread_exit(store):
+    import threading
+
+    seen = []
+
+    def worker():
+        seen.append(store.conn)
+        store.get_all_agents()
+
+    for _ in range(2):
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+    assert seen[0] is seen[1]
+    assert seen[0] is not store.conn
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_opens_own_connection(store):
+    parent_conn = store.conn
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        ok = store.conn is not parent_conn and store.get_all_agents() == []
+        os.write(w, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(w)
+    assert os.read(r, 1) == b"1"
+    os.close(r)
+    os.waitpid(pid, 0)
+    assert store.conn is parent_conn
+
+
+def test_write_behind_runs(store):
+    store.sync_agent("a1")
+    store.start_writer(max_delay=10)
+    now = datetime.now(timezone.utc)
+    run = Run(id="r1", agent="a1", started_at=now)
+    store.enqueue_run_update(run)
+    run.status = "success"
+    store.enqueue_run_update(run)
+    store.enqueue_run_update(Run(id="r2", agent="a1", started_at=now))
+    store.flush_writes()
+    assert store.get_run("r1").status == "success"
+    assert store.get_run("r2").status == "running"
+
+    store.enqueue_run_update(Run(id="r3", agent="a1", started_at=now))
+    store.stop_writer()
+    assert store.get_run("r3") is not None
+
+    # Without a writer the update is synchronous.
+    store.enqueue_run_update(Run(id="r4", agent="a1", started_at=now))
+    assert store.get_run("r4") is not None
+
+
+def test_write_behind_keeps_good_runs_in_failed_batch(store):
+    store.sync_agent("a1")
+    store.start_writer(max_delay=10)
+    now = datetime.now(timezone.utc)
+    store.enqueue_run_update(Run(id="good1", agent="a1", started_at=now))
+    store.enqueue_run_update(Run(id="bad", agent="no_such_agent", started_at=now))
+    store.enqueue_run_update(Run(id="good2", agent="a1", started_at=now))
+    store.flush_writes()
+    assert store.get_run("good1") is not None
+    assert store.get_run("good2") is not None
+    assert store.get_run("bad") is None
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_flush_writes_raises_if_writer_died(store, monkeypatch):
+    def boom(params):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(store, "_write_runs", boom)
+    store.sync_agent("a1")
+    store.start_writer(max_delay=10)
+    store.enqueue_run_update(Run(id="r1", agent="a1", started_at=datetime.now(timezone.utc)))
+    with pytest.raises(RuntimeError, match="writer thread died"):
+        store.flush_writes()
+    # With the writer gone, updates are written synchronously again.
+    store.enqueue_run_update(Run(id="r2", agent="a1", started_at=datetime.now(timezone.utc)))
+    assert store.get_run("r2") is not None
+
+
+def test_iter_runs(store):
+    store.sync_agent("a1")
+    store.sync_agent("a2")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    for i, agent in enumerate(["a1", "a2", "a1"]):
+        started = datetime.fromtimestamp(base + i, timezone.utc)
+        store.save_run(Run(id=f"r{i}", agent=agent, started_at=started))
+    runs = store.iter_runs("a1")
+    assert next(runs).id == "r2"
+    assert [r.id for r in runs] == ["r0"]
+    assert [r.id for r in store.iter_runs(limit=2)] == ["r2", "r1"]
+
+
+def test_naive_run_timestamps_are_utc(store):
+    store.sync_agent("a1")
+    store.save_run(Run(id="r1", agent="a1", started_at=datetime(2026, 1, 2, 3, 4, 5)))
+    assert store.get_run("r1").started_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)